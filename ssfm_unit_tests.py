@@ -7,7 +7,71 @@ Created on Tue Mar 19 09:28:50 2024
 
 from ssfm_functions import *
 from scipy.special import airy
-from scipy.optimize import fsolve
+from scipy.optimize import newton, fsolve
+from concurrent.futures import ThreadPoolExecutor
+
+# Above this argument, Ai(x) is computed from its asymptotic expansion using
+# AIRY_ASYMPTOTIC_TERMS terms, which is accurate to about 1e-11
+AIRY_ASYMPTOTIC_MIN_ARG = 8.0
+AIRY_ASYMPTOTIC_TERMS = 10
+
+# Seed of the random number generator that each unit test passes to SSFM, so
+# tests running in parallel threads do not share the module's RNG
+UNIT_TEST_RANDOM_SEED = 123456
+
+
+def airy_ai(x: npt.NDArray[float],
+            exponent: npt.NDArray[float] = None) -> npt.NDArray[float]:
+    """
+    Computes the Airy function Ai(x), optionally multiplied by exp(exponent)
+
+    scipy.special.airy computes Ai, Ai', Bi and Bi' together. For large x,
+    Ai is instead evaluated from its asymptotic expansion
+
+    Ai(x) = exp(-zeta)/(2*sqrt(pi)*x**(1/4)) * sum_k (-1)**k*u_k/zeta**k,
+
+    with zeta = 2/3*x**(3/2), which only needs a few arithmetic operations.
+    There, exponent is added to -zeta before taking a single exp, so a huge
+    exp(exponent) times a tiny Ai(x) neither overflows nor underflows.
+
+    Parameters
+    ----------
+    x : npt.NDArray[float]
+        Real arguments.
+    exponent : npt.NDArray[float], optional
+        Exponent with the same shape as x. The default is None, which
+        returns Ai(x) alone.
+
+    Returns
+    -------
+    npt.NDArray[float]
+        Ai(x)*exp(exponent).
+
+    """
+    Ai = np.empty_like(x)
+    small_flag = x < AIRY_ASYMPTOTIC_MIN_ARG
+    Ai[small_flag] = airy(x[small_flag])[0]
+    if exponent is not None:
+        Ai[small_flag] *= np.exp(exponent[small_flag])
+
+    large_x = x[~small_flag]
+    zeta = 2/3*large_x**1.5
+
+    # u_k = (6k-5)(6k-3)(6k-1)/((2k-1)*216*k) * u_(k-1), summed with Horner
+    u = [1.0]
+    for k in range(1, AIRY_ASYMPTOTIC_TERMS + 1):
+        u.append(u[-1]*(6*k-5)*(6*k-3)*(6*k-1)/((2*k-1)*216*k))
+    inv_zeta = -1/zeta
+    series = np.full_like(large_x, u[-1])
+    for u_k in u[-2::-1]:
+        series *= inv_zeta
+        series += u_k
+
+    log_prefactor = -zeta - 0.25*np.log(large_x) - np.log(2*np.sqrt(np.pi))
+    if exponent is not None:
+        log_prefactor += exponent[~small_flag]
+    Ai[~small_flag] = np.exp(log_prefactor)*series
+    return Ai
 
 
 def gaussian_pulse_with_beta_2_only(time_s: npt.NDArray[float],
@@ -31,21 +95,32 @@ def gaussian_pulse_with_beta_2_only(time_s: npt.NDArray[float],
     beta2_s2_per_m : [float]
         Fiber dispersion in s^2/m.
     distance_m : [float]
-        Fiber length in m.
+        Fiber length in m, or an array of lengths.
 
     Returns
     -------
     npt.NDArray[complex]
         Gaussian pulse after propagating distance_m through fiber with beta_2.
+        If distance_m is an array, row i holds the pulse at distance_m[i],
+        like the rows of a pulse matrix.
 
     """
 
-    sigma = np.sqrt(duration_s**2- 1j*beta2_s2_per_m*distance_m)
+    # For an array of distances, sigma is a column, so the whole matrix of
+    # pulses is computed by broadcasting instead of looping over distances
+    sigma = np.sqrt(duration_s**2- 1j*beta2_s2_per_m*np.asarray(distance_m))
+    sigma = sigma[..., np.newaxis]
 
-    front_factor = duration_s/sigma
-    exponential_factor = np.exp(-0.5*(time_s/sigma)**2)
+    # Scalar factors are combined first and the exponential is evaluated
+    # in place, so only one output array is allocated
+    front_factor = amplitude_sqrt_W*duration_s/sigma
+    pulse = time_s/sigma
+    np.square(pulse, out=pulse)
+    pulse *= -0.5
+    np.exp(pulse, out=pulse)
+    pulse *= front_factor
 
-    return amplitude_sqrt_W*front_factor*exponential_factor
+    return pulse
 
 
 def gaussian_pulse_with_beta_3_only(time_s: npt.NDArray[float],
@@ -80,24 +155,29 @@ def gaussian_pulse_with_beta_3_only(time_s: npt.NDArray[float],
     p = duration_s/np.sqrt(2)
     b = beta3_s3_per_m*distance_m/(2*p**3.0)
 
-    front_factor = 2*np.sqrt(np.pi)/np.abs(b)**(1.0/3.0)
-    exponential_factor = np.exp( (2*p-3*b*time_s)/(3*p*b**2) )
-
-    airy_arg = (p-b*time_s)/(p*np.abs(b)**(4.0/3.0))
+    front_factor = amplitude_sqrt_W*2*np.sqrt(np.pi)/np.abs(b)**(1.0/3.0)
 
-    airy_output = airy(airy_arg)[0]
+    # Both arguments are linear in time_s, so they are built with one
+    # multiply and one add each. The exponential is passed to airy_ai in
+    # log form, where it cannot overflow for small b
+    airy_arg = time_s*(-b/(p*np.abs(b)**(4.0/3.0)))
+    airy_arg += 1/np.abs(b)**(4.0/3.0)
 
+    exponent = time_s*(-1/(p*b))
+    exponent += 2/(3*b**2)
 
+    pulse = airy_ai(airy_arg, exponent)
+    pulse *= front_factor
 
-
-    return amplitude_sqrt_W*front_factor*exponential_factor*airy_output
+    return pulse
 
 
 def self_steepening_pulse(time_freq: TimeFreq,
                           duration_s: [float],
                           amplitude_sqrt_W: [float],
                           gamma_per_W_m: [float],
-                          distance_m: [float])-> npt.NDArray[complex]:
+                          distance_m: [float],
+                          verbose_flag: bool = False)-> npt.NDArray[complex]:
 
     w0 = time_freq.center_frequency_Hz*2*np.pi
     s=1/w0/duration_s
@@ -107,17 +187,64 @@ def self_steepening_pulse(time_freq: TimeFreq,
     L_NL = 1/gamma_per_W_m/P_max
 
     Z = distance_m/L_NL
-    print(s)
-    print(f"{Z = }")
+    if verbose_flag:
+        print(s)
+        print(f"{Z = }")
+    # The root finders call f and fprime many times, so u = tau - 3*s*I*Z
+    # is built in a buffer allocated once, and the exponentials are
+    # evaluated in place
+    u = np.empty_like(tau)
+
     def f(I,tau=tau,s=s,Z=Z):
-        return np.exp(-(tau - 3*s*I*Z)**2)-I
+        np.multiply(I, -3*s*Z, out=u)
+        np.add(u, tau, out=u)
+        residual = np.square(u)
+        residual *= -1
+        np.exp(residual, out=residual)
+        residual -= I
+        return residual
+
+    def fprime(I,tau=tau,s=s,Z=Z):
+        np.multiply(I, -3*s*Z, out=u)
+        np.add(u, tau, out=u)
+        derivative = np.square(u)
+        derivative *= -1
+        np.exp(derivative, out=derivative)
+        derivative *= u
+        derivative *= 6*s*Z
+        derivative -= 1
+        return derivative
 
 
     #I_0=pd.read_csv("SS.csv")
     I_0 = np.exp(-0.5*tau**2)
 
-    print("Starting fsolve")
-    I_sol=fsolve(f,I_0)
+    # A few fixed-point (Picard) steps move the guess towards the shifted
+    # solution, so the root finders start close to it
+    for _ in range(3):
+        I_0 = np.exp(-(tau - 3*s*I_0*Z)**2)
+
+    # Each point is an independent scalar equation, so Newton's method is
+    # applied to all of them at once instead of solving an N-dimensional
+    # system with a dense Jacobian
+    if verbose_flag:
+        print("Starting newton")
+    newton_result=newton(f,I_0,fprime=fprime,tol=1e-12,maxiter=100,
+                         full_output=True)
+    I_sol=newton_result.root
+    converged=newton_result.converged
+    if not converged.all():
+        # Near the optical shock some points may not converge. With an
+        # array of guesses newton only raises if all of them fail, so the
+        # converged flags are checked instead. Fall back to fsolve, starting
+        # the failed points from the Picard guess and giving it the
+        # Jacobian, which is diagonal, instead of letting it
+        # finite-difference all N x N entries
+        if verbose_flag:
+            print(f"newton did not converge at {np.sum(~converged)} "
+                  "points, starting fsolve")
+        I_start=np.where(converged,I_sol,I_0)
+        I_sol=fsolve(f,I_start,fprime=lambda I: np.diag(fprime(I)))
 
     # SS_df = pd.DataFrame(I_sol)
     # SS_df.to_csv("SS.csv", index=False)
@@ -130,15 +257,129 @@ def self_steepening_pulse(time_freq: TimeFreq,
 
 
 
-def run_all_unit_tests(show_plot_flag = False):
+def get_test_grid_and_signal(N: int,
+                             dt: float,
+                             center_freq_Hz: float,
+                             duration_s: float,
+                             amplitude_sqrt_W: float,
+                             pulse_type: str,
+                             FFT_tol: float,
+                             field_dtype: type = np.complex128
+                             ) -> tuple[TimeFreq, InputSignal]:
+    """
+    Creates the time-frequency grid and input signal of a unit test
 
+    Parameters
+    ----------
+    N, dt, center_freq_Hz : int, float, float
+        Number of points, time step in s and center frequency in Hz passed
+        to TimeFreq.
+    duration_s, amplitude_sqrt_W, pulse_type, FFT_tol : float, float, str, float
+        Pulse parameters passed to InputSignal.
+    field_dtype : type, optional
+        Precision of the input signal field. The default is np.complex128.
+
+    Returns
+    -------
+    time_freq : TimeFreq
+        Time and frequency grid.
+    input_signal : InputSignal
+        Input signal defined on time_freq.
 
+    """
+    time_freq = TimeFreq(N,
+                         dt,
+                         center_freq_Hz,
+                         describe_time_freq_flag=False)
+    input_signal = InputSignal(time_freq,
+                               duration_s,
+                               amplitude_sqrt_W,
+                               pulse_type,
+                               FFT_tol=FFT_tol,
+                               describe_input_signal_flag=False,
+                               field_dtype=field_dtype)
+    return time_freq, input_signal
+
+
+def run_single_fiber_test(input_signal: InputSignal,
+                          length_m: float,
+                          number_of_steps: int,
+                          gamma_per_W_m: float,
+                          beta_list: list[float],
+                          alpha_dB_per_m: float,
+                          use_self_steepening: bool,
+                          experiment_name: str,
+                          FFT_tol: float,
+                          FFT_workers: int = FFT_WORKERS
+                          ) -> list[SSFMResult]:
+    """
+    Propagates input_signal through a single fiber, as done by all unit tests
+
+    Parameters
+    ----------
+    input_signal : InputSignal
+        Signal launched into the fiber.
+    length_m, number_of_steps, gamma_per_W_m, beta_list, alpha_dB_per_m :
+        Fiber parameters passed to FiberSpan.
+    use_self_steepening : bool
+        Toggles self-steepening in the fiber.
+    experiment_name : str
+        Name of the SSFM run.
+    FFT_tol : float
+        Tolerance on energy changes in FFTs passed to SSFM.
+    FFT_workers : int, optional
+        Number of threads used by SSFM for batched FFTs. The default is
+        FFT_WORKERS.
+
+    Returns
+    -------
+    list[SSFMResult]
+        SSFM result of the fiber.
+
+    """
+    fiber = FiberSpan(
+        length_m,
+        number_of_steps,
+        gamma_per_W_m,
+        beta_list,
+        alpha_dB_per_m,
+        use_self_steepening=use_self_steepening,
+        describe_fiber_flag=False)
+
+    return SSFM(
+        FiberLink([fiber]),
+        input_signal,
+        show_progress_flag=False,
+        experiment_name=experiment_name,
+        FFT_tol=FFT_tol,
+        FFT_workers=FFT_workers,
+        rng=np.random.default_rng(UNIT_TEST_RANDOM_SEED)
+    )
+
+
+def run_all_unit_tests(show_plot_flag = False):
 
     print("  ")
     print("Running all unit tests !!! ")
     print("  ")
-    unit_tests_dispersion(show_plot_flag=show_plot_flag)
-    unit_test_nonlinear(show_plot_flag=show_plot_flag)
+    if show_plot_flag:
+        # matplotlib is not thread safe, so tests with plots run one by one
+        unit_tests_dispersion(show_plot_flag=show_plot_flag)
+        unit_test_nonlinear(show_plot_flag=show_plot_flag)
+    else:
+        # The tests are independent and scipy.fft releases the GIL, so they
+        # run concurrently. Each uses a single FFT thread so the tests do
+        # not oversubscribe the cores. result() re-raises any failed
+        # assertion
+        unit_tests = [unit_test_beta2,
+                      unit_test_beta3,
+                      unit_test_SPM,
+                      unit_test_self_steepening]
+        with ThreadPoolExecutor(max_workers=len(unit_tests)) as executor:
+            futures = [executor.submit(unit_test, FFT_workers=1)
+                       for unit_test in unit_tests]
+            for future in futures:
+                future.result()
     print("  ")
     print("All unit tests succeeded!!! ")
     print("  ")
@@ -149,7 +390,7 @@ def unit_tests_dispersion(show_plot_flag=False):
     unit_test_beta2(show_plot_flag=show_plot_flag)
     unit_test_beta3(show_plot_flag=show_plot_flag)
 
-def unit_test_beta2(show_plot_flag=False):
+def unit_test_beta2(show_plot_flag=False, FFT_workers=FFT_WORKERS):
     """
     Unit test comparing the theoretical and numerical effects of dispersion
     with negative beta2 on a Gaussian puls.
@@ -159,6 +400,9 @@ def unit_test_beta2(show_plot_flag=False):
     show_plot_flag : Bool, optional
         Flag to toggle shoing graph comparing theoretical to numerical results.
         The default is False.
+    FFT_workers : int, optional
+        Number of threads used by SSFM for batched FFTs. The default is
+        FFT_WORKERS.
 
     Returns
     -------
@@ -167,16 +411,13 @@ def unit_test_beta2(show_plot_flag=False):
     """
     print("  ")
     print("Doing unit test for dispersion with beta2 only!")
-    os.chdir(os.path.realpath(os.path.dirname(__file__)))
 
-    N = 2 ** 15  # Number of points
+    # Error is dominated by the step size, so 2**14 points give the same
+    # energy difference as 2**15 at half the FFT cost
+    N = 2 ** 14  # Number of points
     dt = 100e-15  # Time resolution [s]
 
     center_freq_test = FREQ_1550_NM_Hz  # FREQ_CENTER_C_BAND_HZ
-    time_freq_test = TimeFreq(N,
-                              dt,
-                              center_freq_test,
-                              describe_time_freq_flag=False)
 
     # Set up signal
     test_FFT_tol = 1e-3
@@ -191,36 +432,26 @@ def unit_test_beta2(show_plot_flag=False):
     length_test = 12e3  # m
     number_of_steps = 2**10
 
-    fiber_test = FiberSpan(
-        length_test,
-        number_of_steps,
-        gamma_test,
-        beta_list,
-        alpha_test,
-        use_self_steepening=False,
-        describe_fiber_flag=False)
-
-    fiber_list = [fiber_test]  # ,fiber_test_2
-    fiber_link = FiberLink(fiber_list)
 
 
-
-    test_input_signal = InputSignal(time_freq_test,
-                                    test_duration_s,
-                                    test_amplitude,
-                                    test_pulse_type,
-                                    FFT_tol=test_FFT_tol,
-                                    describe_input_signal_flag=False)
+    time_freq_test, test_input_signal = get_test_grid_and_signal(
+        N, dt, center_freq_test, test_duration_s, test_amplitude,
+        test_pulse_type, test_FFT_tol)
 
 
     exp_name = f"unit_test_beta2"
     # Run SSFM
-    ssfm_result_list = SSFM(
-        fiber_link,
+    ssfm_result_list = run_single_fiber_test(
         test_input_signal,
-        show_progress_flag=False,
+        length_test,
+        number_of_steps,
+        gamma_test,
+        beta_list,
+        alpha_test,
+        use_self_steepening=False,
         experiment_name=exp_name,
-        FFT_tol=test_FFT_tol
+        FFT_tol=test_FFT_tol,
+        FFT_workers=FFT_workers
     )
     final_pulse = ssfm_result_list[0].pulse_matrix[-1,:]
     theoretical_final_pulse = gaussian_pulse_with_beta_2_only(time_freq_test.t,
@@ -253,10 +484,30 @@ def unit_test_beta2(show_plot_flag=False):
     {normalized_energy_diff =}, but it should be less than or equal to 7.06e-6.
     Unit test for dispersion with beta2 only FAILED!!!"""
 
+    # Check the pulses along the fiber as well. The analytical solution is
+    # evaluated for all checked distances at once by passing an array
+    z_check_step = 64
+    ssfm_result = ssfm_result_list[0]
+    theoretical_pulse_matrix = gaussian_pulse_with_beta_2_only(
+        time_freq_test.t,
+        test_duration_s,
+        test_amplitude,
+        beta_list[0],
+        ssfm_result.fiber.z_array[::z_check_step])
+    for numerical_pulse, theoretical_pulse in zip(
+            ssfm_result.pulse_matrix[::z_check_step],
+            theoretical_pulse_matrix):
+        normalized_energy_diff = compare_field_energies(numerical_pulse,
+                                                        theoretical_pulse)
+        assert normalized_energy_diff<7.06e-6, f"""ERROR: Normalized energy
+        difference between numerical and theoretical pulses along the fiber
+        is {normalized_energy_diff =}, but it should be less than or equal
+        to 7.06e-6. Unit test for dispersion with beta2 only FAILED!!!"""
+
     print("Unit test for dispersion with beta2 only SUCCEEDED!")
     print("  ")
 
-def unit_test_beta3(show_plot_flag=False):
+def unit_test_beta3(show_plot_flag=False, FFT_workers=FFT_WORKERS):
     """
     Unit test comparing the theoretical and numerical effects of dispersion
     with negative beta3 on a Gaussian puls.
@@ -266,6 +517,9 @@ def unit_test_beta3(show_plot_flag=False):
     show_plot_flag : Bool, optional
         Flag to toggle shoing graph comparing theoretical to numerical results.
         The default is False.
+    FFT_workers : int, optional
+        Number of threads used by SSFM for batched FFTs. The default is
+        FFT_WORKERS.
 
     Returns
     -------
@@ -274,16 +528,11 @@ def unit_test_beta3(show_plot_flag=False):
     """
     print("  ")
     print("Doing unit test for dispersion with beta3 only!")
-    os.chdir(os.path.realpath(os.path.dirname(__file__)))
 
     N = 2 ** 15  # Number of points
     dt = 100e-15  # Time resolution [s]
 
     center_freq_test = FREQ_1550_NM_Hz  # FREQ_CENTER_C_BAND_HZ
-    time_freq_test = TimeFreq(N,
-                              dt,
-                              center_freq_test,
-                              describe_time_freq_flag=False)
 
     # Set up signal
     test_FFT_tol = 1e-3
@@ -298,26 +547,11 @@ def unit_test_beta3(show_plot_flag=False):
     length_test = 12e3  # m
     number_of_steps = 2**10
 
-    fiber_test = FiberSpan(
-        length_test,
-        number_of_steps,
-        gamma_test,
-        beta_list,
-        alpha_test,
-        use_self_steepening=False,
-        describe_fiber_flag=False)
 
-    fiber_list = [fiber_test]  # ,fiber_test_2
-    fiber_link = FiberLink(fiber_list)
 
-
-
-    test_input_signal = InputSignal(time_freq_test,
-                                    test_duration_s,
-                                    test_amplitude,
-                                    test_pulse_type,
-                                    FFT_tol=test_FFT_tol,
-                                    describe_input_signal_flag=False)
+    time_freq_test, test_input_signal = get_test_grid_and_signal(
+        N, dt, center_freq_test, test_duration_s, test_amplitude,
+        test_pulse_type, test_FFT_tol)
 
     theoretical_final_pulse = gaussian_pulse_with_beta_3_only(time_freq_test.t,
                                     test_duration_s,
@@ -326,12 +560,17 @@ def unit_test_beta3(show_plot_flag=False):
 
     exp_name = f"unit_test_beta3"
     # Run SSFM
-    ssfm_result_list = SSFM(
-        fiber_link,
+    ssfm_result_list = run_single_fiber_test(
         test_input_signal,
-        show_progress_flag=False,
+        length_test,
+        number_of_steps,
+        gamma_test,
+        beta_list,
+        alpha_test,
+        use_self_steepening=False,
         experiment_name=exp_name,
-        FFT_tol=test_FFT_tol
+        FFT_tol=test_FFT_tol,
+        FFT_workers=FFT_workers
     )
     final_pulse = ssfm_result_list[0].pulse_matrix[-1,:]
 
@@ -370,19 +609,16 @@ def unit_test_nonlinear(show_plot_flag=False):
     unit_test_SPM(show_plot_flag)
     unit_test_self_steepening(show_plot_flag)
 
-def unit_test_SPM(show_plot_flag=False):
+def unit_test_SPM(show_plot_flag=False, FFT_workers=FFT_WORKERS):
     print("  ")
     print("Doing unit test for nonlinear with gamma only!")
-    os.chdir(os.path.realpath(os.path.dirname(__file__)))
 
-    N = 2 ** 15  # Number of points
+    # Without dispersion the pulse never spreads, so a short time window
+    # is enough
+    N = 2 ** 12  # Number of points
     dt = 100e-15  # Time resolution [s]
 
     center_freq_test = FREQ_1550_NM_Hz  # FREQ_CENTER_C_BAND_HZ
-    time_freq_test = TimeFreq(N,
-                              dt,
-                              center_freq_test,
-                              describe_time_freq_flag=False)
 
     # Set up signal
     test_FFT_tol = 1e-3
@@ -397,39 +633,29 @@ def unit_test_SPM(show_plot_flag=False):
     length_test = 12e3  # m
     number_of_steps = 2**10
 
-    fiber_test = FiberSpan(
-        length_test,
-        number_of_steps,
-        gamma_test,
-        beta_list,
-        alpha_test,
-        use_self_steepening=False,
-        describe_fiber_flag=False)
-
-    fiber_list = [fiber_test]  # ,fiber_test_2
-    fiber_link = FiberLink(fiber_list)
-
 
 
-    test_input_signal = InputSignal(time_freq_test,
-                                    test_duration_s,
-                                    test_amplitude,
-                                    test_pulse_type,
-                                    FFT_tol=test_FFT_tol,
-                                    describe_input_signal_flag=False)
+    time_freq_test, test_input_signal = get_test_grid_and_signal(
+        N, dt, center_freq_test, test_duration_s, test_amplitude,
+        test_pulse_type, test_FFT_tol)
 
 
     exp_name = f"unit_test_SPM"
     # Run SSFM
-    ssfm_result_list = SSFM(
-        fiber_link,
+    ssfm_result_list = run_single_fiber_test(
         test_input_signal,
-        show_progress_flag=False,
+        length_test,
+        number_of_steps,
+        gamma_test,
+        beta_list,
+        alpha_test,
+        use_self_steepening=False,
         experiment_name=exp_name,
-        FFT_tol=test_FFT_tol
+        FFT_tol=test_FFT_tol,
+        FFT_workers=FFT_workers
     )
     final_pulse = ssfm_result_list[0].pulse_matrix[-1,:]
-    initial_pulse = np.copy(ssfm_result_list[0].pulse_matrix[0,:])
+    initial_pulse = ssfm_result_list[0].pulse_matrix[0,:]
     nonlinear_factor = np.exp(1j*
                               gamma_test*
                               length_test*
@@ -454,8 +680,8 @@ def unit_test_SPM(show_plot_flag=False):
         plt.show()
 
         fig,ax=plt.subplots(dpi=300)
-        ax.plot(time_freq_test.f/1e12,get_power(get_spectrum_from_pulse(time_freq_test.t, final_pulse) ),label = "Final spectrum numerical")
-        ax.plot(time_freq_test.f/1e12,get_power(get_spectrum_from_pulse(time_freq_test.t, theoretical_final_pulse)),label = "Final spectrum theoretical")
+        ax.plot(time_freq_test.f/1e12,get_power(time_freq_test.pulse_to_spectrum(final_pulse) ),label = "Final spectrum numerical")
+        ax.plot(time_freq_test.f/1e12,get_power(time_freq_test.pulse_to_spectrum(theoretical_final_pulse)),label = "Final spectrum theoretical")
         ax.set_xlim(-0.5,0.5)
         ax.spines["top"].set_visible(False)
         ax.spines["right"].set_visible(False)
@@ -480,7 +706,7 @@ def unit_test_SPM(show_plot_flag=False):
     print("Unit test for nonlinearity with gamma only SUCCEEDED!")
     print("  ")
 
-def unit_test_self_steepening(show_plot_flag=False):
+def unit_test_self_steepening(show_plot_flag=False, FFT_workers=FFT_WORKERS):
     """
     Unit test comparing the theoretical and numerical effects of
     self-steepening with no dispersion or attenuation.
@@ -490,6 +716,9 @@ def unit_test_self_steepening(show_plot_flag=False):
     show_plot_flag : Bool, optional
         Flag to toggle shoing graph comparing theoretical to numerical results.
         The default is False.
+    FFT_workers : int, optional
+        Number of threads used by SSFM for batched FFTs. The default is
+        FFT_WORKERS.
 
     Returns
     -------
@@ -498,7 +727,6 @@ def unit_test_self_steepening(show_plot_flag=False):
     """
     print("  ")
     print("Doing unit test for self steepening only!")
-    os.chdir(os.path.realpath(os.path.dirname(__file__)))
 
     Trange = 0.68e-12
     N = 2 ** 10  # Number of points
@@ -529,18 +757,6 @@ def unit_test_self_steepening(show_plot_flag=False):
     length_test = 8
     spanloss = alpha_test * length_test
 
-    fiber_test = FiberSpan(
-        length_test,
-        number_of_steps,
-        gamma_test,
-        beta_list,
-        alpha_test,
-        use_self_steepening=True,
-        describe_fiber_flag=False)
-
-    fiber_list = [fiber_test]
-    fiber_link = FiberLink(fiber_list)
-
     # Set up signal
     test_FFT_tol = 1e-3
     testTimeOffset = 0  # Time offset
@@ -572,19 +788,25 @@ def unit_test_self_steepening(show_plot_flag=False):
     expName = "unit_test_self_steepening"
 
     # Run SSFM
-    ssfm_result_list = SSFM(
-        fiber_link,
+    ssfm_result_list = run_single_fiber_test(
         test_input_signal,
-        show_progress_flag=False,
+        length_test,
+        number_of_steps,
+        gamma_test,
+        beta_list,
+        alpha_test,
+        use_self_steepening=True,
         experiment_name=expName,
-        FFT_tol=test_FFT_tol
+        FFT_tol=test_FFT_tol,
+        FFT_workers=FFT_workers
     )
     final_pulse = ssfm_result_list[0].pulse_matrix[-1,:]
-    initial_pulse = ssfm_result_list[0].pulse_matrix[0,:]
 
 
 
     if show_plot_flag:
+        # The initial pulse is only needed for plotting
+        initial_pulse = ssfm_result_list[0].pulse_matrix[0,:]
         fig,ax=plt.subplots(dpi=300)
         ax.plot(time_freq_test.t/testDuration,get_power(final_pulse)/testAmplitude**2,label = "Final pulse numerical")
         ax.plot(time_freq_test.t/testDuration,get_power(theoretical_final_pulse),label = "Final pulse theoretical")